@@ -2,13 +2,24 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
+import os
+import threading
 import time
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
 from typing import Any
 
 import yaml
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
+
 from pathlib import Path
 
 from homeassistant.components import persistent_notification
@@ -24,8 +35,30 @@ from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util.yaml import Secrets, load_yaml_dict
 
+try:
+    from homeassistant.components.lovelace.const import (  # type: ignore
+        CONF_ICON,
+        CONF_REQUIRE_ADMIN,
+        CONF_SHOW_IN_SIDEBAR,
+        CONF_TITLE,
+        CONF_URL_PATH,
+        LOVELACE_DATA,
+        MODE_STORAGE,
+    )
+    from homeassistant.components.lovelace.dashboard import (  # type: ignore
+        ConfigNotFound,
+        DashboardsCollection,
+        LovelaceStorage,
+    )
+except ImportError:
+    # Storage dashboard import is skipped when Lovelace internals move.
+    _LOVELACE_AVAILABLE = False
+else:
+    _LOVELACE_AVAILABLE = True
+
 from .api import SolarCubeApi
 from .const import (
+    AUTOMATIONS_TEMPLATE_PATH,
     CONF_AGENTS_BUCKET,
     CONF_CONFIGURE_ENERGY_DASHBOARD,
     CONF_DATA_BUCKET,
@@ -37,20 +70,318 @@ from .const import (
     DEFAULT_CONFIGURE_ENERGY_DASHBOARD,
     DEFAULT_IMPORT_DASHBOARDS,
     DOMAIN,
+    ENERGY_TEMPLATE_PATH,
+    INSTALLER_SCRIPT_PATH,
+    PACKAGED_DASHBOARDS_DIR,
+    STORAGE_DASHBOARD_SPECS,
 )
 from .coordinator import (
     SolarCubeDataCoordinator,
     SolarCubeForecastCoordinator,
     SolarCubeOptimalActionsCoordinator,
 )
+from .frontend_installer import INSTALLER_SCRIPT_SHA256, install_frontend_deps
 from .sensor_definitions import SENSOR_DEFINITIONS
 
+try:
+    # Shipped automations baked into a Python literal by tools/bake_dashboards.py.
+    from .dashboards._automations_data import (
+        AUTOMATIONS as _BAKED_AUTOMATIONS,
+        SOURCE_HASH as _BAKED_AUTOMATIONS_HASH,
+    )
+except ImportError:
+    _BAKED_AUTOMATIONS = None
+    _BAKED_AUTOMATIONS_HASH = None
+
 PLATFORMS = ["sensor"]
 
 LOGGER = logging.getLogger(__name__)
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
+# energy.bak.<ts> files kept in .storage when the Energy dashboard is rewritten.
+_ENERGY_BACKUPS_TO_KEEP = 5
+
+# Parsed YAML/JSON assets keyed by (path, mtime_ns, size, loader), so setup and
+# every entry reload reuse the previous parse while the file on disk is unchanged.
+_PARSE_CACHE: OrderedDict[tuple[str, int, int, str], Any] = OrderedDict()
+_PARSE_CACHE_MAX_ENTRIES = 64
+_PARSE_CACHE_LOCK = threading.Lock()
+
+# Shipped (vendored) assets only change when the integration is updated, which
+# needs a restart, so once loaded they are served without an executor hop.
+_SHIPPED_ASSETS: dict[Path, Any] = {}
+
+
+@lru_cache(maxsize=16)
+def _config_path(config_dir: str, *parts: str) -> Path:
+    """Return a path under the HA config dir (config_dir is fixed per install)."""
+    return Path(config_dir).joinpath(*parts)
+
+
+def _cached_parse(path: Path, loader: Callable[[Path], Any]) -> Any:
+    """Return loader(path), reusing the cached result while the file is unchanged.
+
+    Runs in the executor (stats the file and reads it on a miss). Callers that
+    mutate the result must copy it first.
+    """
+    st = os.stat(path)
+    key = (str(path), st.st_mtime_ns, st.st_size, loader.__qualname__)
+    with _PARSE_CACHE_LOCK:
+        if key in _PARSE_CACHE:
+            _PARSE_CACHE.move_to_end(key)
+            return _PARSE_CACHE[key]
+
+    data = loader(path)
+
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE[key] = data
+        while len(_PARSE_CACHE) > _PARSE_CACHE_MAX_ENTRIES:
+            _PARSE_CACHE.popitem(last=False)
+    return data
+
+
+async def _async_load_shipped_asset(
+    hass: HomeAssistant, path: Path, loader: Callable[[Path], Any]
+) -> Any:
+    """Return loader(path) for a file shipped with the integration.
+
+    The first call runs the loader in the executor; later calls in the same
+    process return the memoized result from the event loop. Empty results are
+    not memoized so a failed load is retried. Never use this for files under
+    the HA config dir, which the user can edit at any time.
+    """
+    if path in _SHIPPED_ASSETS:
+        return _SHIPPED_ASSETS[path]
+    data = await hass.async_add_executor_job(loader, path)
+    if data:
+        _SHIPPED_ASSETS[path] = data
+    return data
+
+
+@lru_cache(maxsize=8)
+def _language_prefix(language: str | None) -> str:
+    """Return the primary subtag of a language code ("pl-PL" -> "pl")."""
+    lang = (language or "").lower()
+    return (lang.split("-")[0] or "en").strip() or "en"
+
+
+def _source_hash(raw: bytes) -> str:
+    """Hash of a shipped YAML file, as recorded by tools/bake_dashboards.py."""
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _try_read_bytes(path: Path) -> bytes | None:
+    """Return the contents of path, or None when it does not exist."""
+    try:
+        with open(path, "rb") as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
+
+
+def _read_json_sidecar(path: Path) -> Any:
+    """Return the data baked into the JSON sidecar of a shipped YAML file.
+
+    Sidecars are written by tools/bake_dashboards.py. Returns None when the
+    sidecar is missing, unreadable or was baked from different YAML content.
+    """
+    try:
+        sidecar = json.loads(path.with_suffix(".json").read_bytes())
+        source_hash = _source_hash(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(sidecar, dict):
+        return None
+    if sidecar.get("_source_hash") != source_hash:
+        return None
+    return sidecar.get("data")
+
+
+def _filter_yaml_list(data: Any) -> list[dict[str, Any]]:
+    if not isinstance(data, list):
+        return []
+    return [item for item in data if isinstance(item, dict)]
+
+
+def _parse_yaml_list(path: Path) -> list[dict[str, Any]]:
+    raw = path.read_text(encoding="utf-8")
+    try:
+        data = yaml.safe_load(raw) if raw.strip() else []
+    except Exception:  # noqa: BLE001
+        return []
+    return _filter_yaml_list(data)
+
+
+def _parse_shipped_yaml_list(path: Path) -> list[dict[str, Any]]:
+    data = _read_json_sidecar(path)
+    if isinstance(data, list):
+        return _filter_yaml_list(data)
+    return _parse_yaml_list(path)
+
+
+def _load_yaml_list(
+    path: Path, *, shipped: bool = False
+) -> list[dict[str, Any]]:
+    loader = _parse_shipped_yaml_list if shipped else _parse_yaml_list
+    try:
+        return _cached_parse(path, loader)
+    except OSError:
+        return []
+
+
+# libyaml's C emitter when available; same output as yaml.safe_dump.
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def _dump_yaml(data: Any) -> str:
+    return yaml.dump(
+        data, Dumper=_YAML_DUMPER, sort_keys=False, allow_unicode=True
+    )
+
+
+# libyaml's C parser when available; only its event stream is used.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_AutomationsScan = tuple[frozenset[str], frozenset[str], bool]
+
+
+def _scan_automations(path: Path) -> _AutomationsScan:
+    """Collect automation ids/aliases from a YAML list using parser events.
+
+    Nothing is constructed, so this stays cheap for large files. The flag says
+    whether the file is a single plain block-style list starting at column 0
+    that more "- ..." items can be appended to as text; anything else (an
+    indented or flow-style list, anchors/aliases, tags, several documents) is
+    reported as not appendable.
+    """
+    ids: set[str] = set()
+    aliases: set[str] = set()
+    appendable = True
+    documents = 0
+    depth = 0
+    in_item = False
+    key: str | None = None
+    expect_key = True
+
+    try:
+        for event in yaml.parse(path.read_bytes(), Loader=_YAML_LOADER):
+            if isinstance(event, yaml.DocumentStartEvent):
+                documents += 1
+                appendable = appendable and not event.explicit
+                appendable = appendable and documents == 1
+                continue
+            if isinstance(event, yaml.DocumentEndEvent):
+                appendable = appendable and not event.explicit
+                continue
+            if isinstance(event, yaml.NodeEvent):
+                if (
+                    isinstance(event, yaml.AliasEvent)
+                    or event.anchor is not None
+                    or event.tag is not None
+                ):
+                    appendable = False
+            elif not isinstance(event, yaml.CollectionEndEvent):
+                continue
+
+            if isinstance(event, yaml.CollectionStartEvent):
+                # Appended items start at column 0, so the list must too.
+                if depth == 0 and (
+                    not isinstance(event, yaml.SequenceStartEvent)
+                    or event.flow_style
+                    or event.start_mark.column != 0
+                ):
+                    appendable = False
+                depth += 1
+                if depth == 2:
+                    in_item = isinstance(event, yaml.MappingStartEvent)
+                    key, expect_key = None, True
+                continue
+
+            if isinstance(event, yaml.CollectionEndEvent):
+                depth -= 1
+                if depth != 2:
+                    continue
+            elif depth == 0:
+                # A scalar or alias as the whole document.
+                appendable = False
+                continue
+            elif depth != 2:
+                continue
+
+            # A complete key or value node of an automation mapping.
+            if not in_item:
+                continue
+            value = (
+                event.value.strip()
+                if isinstance(event, yaml.ScalarEvent)
+                else None
+            )
+            if expect_key:
+                key, expect_key = value, False
+                continue
+            if value and key == "id":
+                ids.add(value)
+            elif value and key == "alias":
+                aliases.add(value.lower())
+            key, expect_key = None, True
+    except yaml.YAMLError:
+        return frozenset(), frozenset(), False
+
+    return frozenset(ids), frozenset(aliases), appendable
+
+
+def _automation_keys(
+    automations: list[dict[str, Any]],
+) -> tuple[set[str], set[str]]:
+    """Return the non-empty ids and lowercased aliases of automations."""
+    ids: set[str] = set()
+    aliases: set[str] = set()
+    for automation in automations:
+        automation_id = automation.get("id")
+        if isinstance(automation_id, str) and (
+            automation_id := automation_id.strip()
+        ):
+            ids.add(automation_id)
+        automation_alias = automation.get("alias")
+        if isinstance(automation_alias, str) and (
+            automation_alias := automation_alias.strip()
+        ):
+            aliases.add(automation_alias.lower())
+    return ids, aliases
+
+
+def _load_shipped_automations(path: Path) -> list[dict[str, Any]]:
+    # The baked module is only trusted while it matches the YAML next to it.
+    if _BAKED_AUTOMATIONS is not None:
+        try:
+            raw = _try_read_bytes(path)
+        except OSError:
+            return []
+        if raw is None:
+            return []
+        if _source_hash(raw) == _BAKED_AUTOMATIONS_HASH:
+            return _BAKED_AUTOMATIONS
+    return _load_yaml_list(path, shipped=True)
+
+
+def _parse_json(path: Path) -> Any:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _json_loads(raw: bytes) -> Any:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError.
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_dumps_pretty(data: Any) -> bytes:
+    """Serialize data the way HA stores .storage files (2-space indent)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     return True
@@ -62,17 +393,35 @@ async def _async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     entry_data = domain_data.get(entry.entry_id, {})
     if entry_data.pop("_suppress_next_reload", False):
         return
-    await hass.config_entries.async_reload(entry.entry_id)
+    # Scheduling cancels a pending setup retry and coalesces rapid updates.
+    hass.config_entries.async_schedule_reload(entry.entry_id)
 
 
 async def _async_run_frontend_installer(
     hass: HomeAssistant,
 ) -> tuple[int, str, str]:
-    """Run the bundled installer hook script inside the HA environment."""
-    script_path = Path(__file__).parent / "tools" / "install_frontend_deps.sh"
-    if not script_path.exists():
+    """Run the bundled installer hook inside the HA environment.
+
+    The shipped script is executed in-process by frontend_installer; a script
+    whose content differs from the revision it mirrors is run with sh instead.
+    """
+    script_path = INSTALLER_SCRIPT_PATH
+
+    def _script_sha256() -> str | None:
+        try:
+            return hashlib.sha256(script_path.read_bytes()).hexdigest()
+        except FileNotFoundError:
+            return None
+
+    script_sha256 = await hass.async_add_executor_job(_script_sha256)
+    if script_sha256 is None:
         return (127, "", f"Missing installer script: {script_path}")
 
+    if script_sha256 == INSTALLER_SCRIPT_SHA256:
+        return await hass.async_add_executor_job(
+            install_frontend_deps, hass.config.config_dir
+        )
+
     proc = await asyncio.create_subprocess_exec(
         "sh",
         str(script_path),
@@ -99,6 +448,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         token=config[CONF_TOKEN],
         org=config[CONF_ORG],
     )
+    await api.async_connect()
 
     data_coordinator = SolarCubeDataCoordinator(
         hass, api, config, SENSOR_DEFINITIONS
@@ -106,9 +456,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     forecast_coordinator = SolarCubeForecastCoordinator(hass, api, config)
     optimal_coordinator = SolarCubeOptimalActionsCoordinator(hass, api, config)
 
-    await data_coordinator.async_config_entry_first_refresh()
-    await forecast_coordinator.async_config_entry_first_refresh()
-    await optimal_coordinator.async_config_entry_first_refresh()
+    # The three refreshes are independent queries; overlap their round-trips.
+    # A TaskGroup cancels and awaits the others when one fails, so none are
+    # left running against the session closed below.
+    try:
+        async with asyncio.TaskGroup() as group:
+            for coordinator in (
+                data_coordinator,
+                forecast_coordinator,
+                optimal_coordinator,
+            ):
+                group.create_task(coordinator.async_config_entry_first_refresh())
+    except BaseExceptionGroup as err:
+        # Unload is not called when setup fails; release the session here.
+        await api.async_close()
+        # Re-raise the failure itself (e.g. ConfigEntryNotReady) for HA.
+        raise err.exceptions[0] from err.exceptions[0].__cause__
+    except BaseException:
+        await api.async_close()
+        raise
 
     domain_data = hass.data.setdefault(DOMAIN, {})
     domain_data[entry.entry_id] = {
@@ -209,46 +575,37 @@ async def _async_ensure_automations(
         return False
     domain_data["automations_imported"] = True
 
-    shipped_path = Path(__file__).parent / "dashboards" / "automations.yaml"
-    if not shipped_path.exists():
-        return False
-
-    config_path = Path(hass.config.config_dir) / "automations.yaml"
-
-    def _load_yaml_list(path: Path) -> list[dict[str, Any]]:
-        try:
-            raw = path.read_text(encoding="utf-8")
-        except OSError:
-            return []
-        try:
-            data = yaml.safe_load(raw) if raw.strip() else []
-        except Exception:  # noqa: BLE001
-            return []
-        if data is None:
-            return []
-        if not isinstance(data, list):
-            return []
-        return [item for item in data if isinstance(item, dict)]
+    shipped_path = AUTOMATIONS_TEMPLATE_PATH
+    config_path = _config_path(hass.config.config_dir, "automations.yaml")
 
-    shipped = await hass.async_add_executor_job(_load_yaml_list, shipped_path)
+    shipped = await _async_load_shipped_asset(
+        hass, shipped_path, _load_shipped_automations
+    )
     if not shipped:
         return False
 
     def _read_merge_write() -> bool:
-        existing = _load_yaml_list(config_path) if config_path.exists() else []
+        try:
+            existing_ids, existing_aliases, appendable = _cached_parse(
+                config_path, _scan_automations
+            )
+        except FileNotFoundError:
+            existing_ids, existing_aliases, appendable = (
+                frozenset(),
+                frozenset(),
+                True,
+            )
+        except OSError as err:
+            LOGGER.warning("Failed reading %s: %s", config_path, err)
+            return False
 
-        existing_ids = {
-            str(a.get("id")).strip()
-            for a in existing
-            if isinstance(a.get("id"), str) and a.get("id").strip()
-        }
-        existing_aliases = {
-            str(a.get("alias")).strip().lower()
-            for a in existing
-            if isinstance(a.get("alias"), str) and a.get("alias").strip()
-        }
+        existing: list[dict[str, Any]] = []
+        if not appendable:
+            # The file gets re-emitted as a whole, so it must be loaded anyway.
+            existing = _load_yaml_list(config_path)
+            existing_ids, existing_aliases = _automation_keys(existing)
 
-        changed = False
+        new_automations: list[dict[str, Any]] = []
         for automation in shipped:
             automation_id = str(automation.get("id") or "").strip()
             automation_alias = str(automation.get("alias") or "").strip()
@@ -263,18 +620,27 @@ async def _async_ensure_automations(
             ):
                 continue
 
-            existing.append(automation)
-            changed = True
+            new_automations.append(automation)
 
-        if not changed:
+        if not new_automations:
             return False
 
+        if appendable:
+            # Append only the new items; keeps the user's file byte-for-byte.
+            try:
+                raw = _try_read_bytes(config_path) or b""
+            except OSError as err:
+                LOGGER.warning("Failed reading %s: %s", config_path, err)
+                return False
+            if raw and not raw.endswith(b"\n"):
+                raw += b"\n"
+            content = raw + _dump_yaml(new_automations).encode("utf-8")
+        else:
+            content = _dump_yaml(existing + new_automations).encode("utf-8")
+        content += b"\n"
+
         try:
-            config_path.write_text(
-                yaml.safe_dump(existing, sort_keys=False, allow_unicode=True)
-                + "\n",
-                encoding="utf-8",
-            )
+            config_path.write_bytes(content)
         except OSError as err:
             LOGGER.warning("Failed writing %s: %s", config_path, err)
             return False
@@ -285,7 +651,7 @@ async def _async_ensure_automations(
     if changed:
         LOGGER.warning(
             "Installed Solar Cube automations into %s",
-            Path(hass.config.config_dir) / "automations.yaml",
+            config_path,
         )
         # Best-effort apply without full restart.
         try:
@@ -305,17 +671,18 @@ async def _async_configure_energy_dashboard(hass: HomeAssistant) -> bool:
     and merges it into the existing Energy store, preserving unrelated fields.
     """
 
-    storage_dir = Path(hass.config.config_dir) / ".storage"
+    storage_dir = _config_path(hass.config.config_dir, ".storage")
     storage_path = storage_dir / "energy"
-    template_path = Path(__file__).parent / "dashboards" / "energy.json"
-
-    if not template_path.exists():
-        LOGGER.warning("Energy dashboard template missing: %s", template_path)
-        return False
+    template_path = ENERGY_TEMPLATE_PATH
 
-    def _load_template_data() -> dict[str, Any] | None:
+    def _load_template_data(template_path: Path) -> dict[str, Any] | None:
         try:
-            template = json.loads(template_path.read_text(encoding="utf-8"))
+            template = _cached_parse(template_path, _parse_json)
+        except FileNotFoundError:
+            LOGGER.warning(
+                "Energy dashboard template missing: %s", template_path
+            )
+            return None
         except OSError as err:
             LOGGER.warning(
                 "Failed reading energy template %s: %s", template_path, err
@@ -330,7 +697,9 @@ async def _async_configure_energy_dashboard(hass: HomeAssistant) -> bool:
         data = template.get("data")
         return data if isinstance(data, dict) else None
 
-    template_data = await hass.async_add_executor_job(_load_template_data)
+    template_data = await _async_load_shipped_asset(
+        hass, template_path, _load_template_data
+    )
     if not template_data:
         return False
 
@@ -341,18 +710,20 @@ async def _async_configure_energy_dashboard(hass: HomeAssistant) -> bool:
             LOGGER.warning("Cannot create %s: %s", storage_dir, err)
             return False
 
-        raw = ""
+        raw = b""
+        storage_exists = True
         existing: dict[str, Any] = {}
-        if storage_path.exists():
-            try:
-                raw = storage_path.read_text(encoding="utf-8")
-                existing = json.loads(raw) if raw.strip() else {}
-            except OSError as err:
-                LOGGER.warning("Failed reading %s: %s", storage_path, err)
-                return False
-            except json.JSONDecodeError as err:
-                LOGGER.warning("Invalid JSON in %s: %s", storage_path, err)
-                return False
+        try:
+            raw = storage_path.read_bytes()
+            existing = _json_loads(raw) if raw.strip() else {}
+        except FileNotFoundError:
+            storage_exists = False
+        except OSError as err:
+            LOGGER.warning("Failed reading %s: %s", storage_path, err)
+            return False
+        except json.JSONDecodeError as err:
+            LOGGER.warning("Invalid JSON in %s: %s", storage_path, err)
+            return False
 
         if not isinstance(existing, dict):
             existing = {}
@@ -361,55 +732,69 @@ async def _async_configure_energy_dashboard(hass: HomeAssistant) -> bool:
         if not isinstance(current_data, dict):
             current_data = {}
 
+        # Track changes as they are made instead of re-serializing and
+        # comparing the whole store. energy_sources is still compared in full
+        # against the template, since that is the part being replaced.
+        mutated = not storage_exists
         new_data = dict(current_data)
         # Replace energy_sources with the Solar Cube template.
-        if isinstance(template_data.get("energy_sources"), list):
-            new_data["energy_sources"] = template_data["energy_sources"]
+        template_sources = template_data.get("energy_sources")
+        if (
+            isinstance(template_sources, list)
+            and current_data.get("energy_sources") != template_sources
+        ):
+            new_data["energy_sources"] = template_sources
+            mutated = True
         # Ensure required top-level keys exist.
-        if "device_consumption" not in new_data:
-            new_data["device_consumption"] = template_data.get(
-                "device_consumption", []
-            )
-        if "device_consumption_water" not in new_data:
-            new_data["device_consumption_water"] = template_data.get(
-                "device_consumption_water", []
-            )
-
-        if new_data == current_data and storage_path.exists():
-            return False
+        for data_key in ("device_consumption", "device_consumption_water"):
+            if data_key not in new_data:
+                new_data[data_key] = template_data.get(data_key, [])
+                mutated = True
 
         out = dict(existing)
         # Preserve existing version/minor_version if present; otherwise use template defaults.
         if "version" not in out:
             out["version"] = 1
+            mutated = True
         if "minor_version" not in out:
             # Home Assistant's Energy store commonly uses minor_version 2.
             out["minor_version"] = 2
-        out["key"] = "energy"
+            mutated = True
+        if out.get("key") != "energy":
+            out["key"] = "energy"
+            mutated = True
+        if existing.get("data") is not current_data:
+            # "data" was missing or not a dict and is written from scratch.
+            mutated = True
         out["data"] = new_data
 
+        if not mutated:
+            return False
+
+        new_raw = _json_dumps_pretty(out)
+
         try:
-            backup_path = storage_path.with_name(
-                f"energy.bak.{int(time.time())}"
-            )
             if raw:
-                backup_path.write_text(raw, encoding="utf-8")
+                backup_path = storage_path.with_name(
+                    f"energy.bak.{int(time.time())}"
+                )
+                backup_path.write_bytes(raw)
+                _prune_energy_backups(storage_dir)
         except Exception:  # noqa: BLE001
             # Backups are best-effort.
             pass
 
         tmp_path = storage_path.with_suffix(".tmp")
         try:
-            tmp_path.write_text(
-                json.dumps(out, ensure_ascii=False, indent=2) + "\n",
-                encoding="utf-8",
-            )
-            tmp_path.replace(storage_path)
+            with open(tmp_path, "wb") as tmp_file:
+                tmp_file.write(new_raw)
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+            os.replace(tmp_path, storage_path)
         except OSError as err:
             LOGGER.warning("Failed writing %s: %s", storage_path, err)
             try:
-                if tmp_path.exists():
-                    tmp_path.unlink()
+                tmp_path.unlink(missing_ok=True)
             except OSError:
                 pass
             return False
@@ -424,6 +809,23 @@ async def _async_configure_energy_dashboard(hass: HomeAssistant) -> bool:
     return changed
 
 
+def _prune_energy_backups(storage_dir: Path) -> None:
+    """Delete all but the newest energy.bak.<ts> files."""
+
+    def _timestamp(path: Path) -> int:
+        try:
+            return int(path.name.rsplit(".", 1)[-1])
+        except ValueError:
+            return 0
+
+    backups = sorted(storage_dir.glob("energy.bak.*"), key=_timestamp)
+    for path in backups[:-_ENERGY_BACKUPS_TO_KEEP]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(
         entry, PLATFORMS
@@ -435,7 +837,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         api = entry_data.get("api")
         if api is not None:
             try:
-                api.close()
+                await api.async_close()
             except Exception:  # noqa: BLE001
                 pass
 
@@ -487,24 +889,8 @@ async def _async_ensure_storage_dashboards(
     It is a one-shot best-effort import from YAML files under /config/dashboards.
     """
 
-    # Lovelace may not be ready yet during startup.
-    try:
-        from homeassistant.components.lovelace.const import (  # type: ignore
-            CONF_ICON,
-            CONF_REQUIRE_ADMIN,
-            CONF_SHOW_IN_SIDEBAR,
-            CONF_TITLE,
-            CONF_URL_PATH,
-            LOVELACE_DATA,
-            MODE_STORAGE,
-        )
-        from homeassistant.components.lovelace.dashboard import (  # type: ignore
-            ConfigNotFound,
-            DashboardsCollection,
-            LovelaceStorage,
-        )
-    except Exception as err:  # noqa: BLE001
-        LOGGER.debug("Lovelace imports unavailable: %s", err)
+    if not _LOVELACE_AVAILABLE:
+        LOGGER.debug("Lovelace imports unavailable")
         return False
 
     if LOVELACE_DATA not in hass.data:
@@ -526,72 +912,38 @@ async def _async_ensure_storage_dashboards(
     changed = False
 
     # Storage dashboards source files live in /config/dashboards.
-    dashboards_dir = Path(hass.config.config_dir) / "dashboards"
-    if not dashboards_dir.exists():
-        try:
-            dashboards_dir.mkdir(parents=True, exist_ok=True)
-            LOGGER.debug("Created dashboards directory: %s", dashboards_dir)
-        except OSError as err:
-            LOGGER.warning(
-                "Solar Cube storage dashboard import skipped: failed to create %s: %s",
-                dashboards_dir,
-                err,
-            )
-            return False
+    dashboards_dir = _config_path(hass.config.config_dir, "dashboards")
+
+    secrets = Secrets(_config_path(hass.config.config_dir))
+
+    def _parse_dashboard_yaml(path: Path) -> dict[str, Any]:
+        # Shipped dashboards come with a pre-serialized JSON sidecar.
+        if path.parent == PACKAGED_DASHBOARDS_DIR:
+            data = _read_json_sidecar(path)
+            if isinstance(data, dict):
+                return data
+        return load_yaml_dict(str(path), secrets)
+
+    def _load_dashboard_yaml(path: Path) -> dict[str, Any]:
+        return _cached_parse(path, _parse_dashboard_yaml)
+
+    language = _language_prefix(getattr(hass.config, "language", None))
+    dashboard_specs = STORAGE_DASHBOARD_SPECS.get(
+        language, STORAGE_DASHBOARD_SPECS["en"]
+    )
+
+    lovelace_data = hass.data[LOVELACE_DATA]
 
-    # Fallback: dashboards bundled with the integration package.
-    packaged_dashboards_dir = Path(__file__).parent / "dashboards"
-
-    def _language_prefix() -> str:
-        lang = (getattr(hass.config, "language", None) or "").lower()
-        return (lang.split("-")[0] or "en").strip() or "en"
-
-    is_pl = _language_prefix() == "pl"
-
-    # Create 3 dashboards in storage mode with URL paths that satisfy HA validation.
-    # (URL paths must be slug-like and contain a hyphen.)
-    if is_pl:
-        dashboard_specs: list[dict[str, str]] = [
-            {
-                "url_path": "panel-solar-cube",
-                "title": "Solar Cube",
-                "icon": "mdi:solar-panel",
-                "filename": "panel_solar_cube_pl.yaml",
-            },
-            {
-                "url_path": "historia-solar-cube",
-                "title": "Solar Cube Historia",
-                "icon": "mdi:history",
-                "filename": "history_solar_cube_pl.yaml",
-            },
-            {
-                "url_path": "prognozy-solar-cube",
-                "title": "Solar Cube Prognozy",
-                "icon": "mdi:weather-sunny-alert",
-                "filename": "forecasts_solar_cube_pl.yaml",
-            },
-        ]
-    else:
-        dashboard_specs = [
-            {
-                "url_path": "panel-solar-cube",
-                "title": "Solar Cube",
-                "icon": "mdi:solar-panel",
-                "filename": "panel_solar_cube_en.yaml",
-            },
-            {
-                "url_path": "historia-solar-cube",
-                "title": "Solar Cube History",
-                "icon": "mdi:history",
-                "filename": "history_solar_cube_en.yaml",
-            },
-            {
-                "url_path": "prognozy-solar-cube",
-                "title": "Solar Cube Forecasts",
-                "icon": "mdi:weather-sunny-alert",
-                "filename": "forecasts_solar_cube_en.yaml",
-            },
-        ]
+    # If Lovelace already knows a dashboard, do nothing for it.
+    pending_specs = [
+        spec
+        for spec in dashboard_specs
+        if spec["url_path"] not in lovelace_data.dashboards
+    ]
+    if not pending_specs:
+        # Everything is registered already (the usual case after the first
+        # import): skip loading the collection and touching the filesystem.
+        return False
 
     dashboards_collection = DashboardsCollection(hass)
     await dashboards_collection.async_load()
@@ -601,54 +953,77 @@ async def _async_ensure_storage_dashboards(
         if isinstance(item, dict)
     }
 
-    lovelace_data = hass.data[LOVELACE_DATA]
-
-    for spec in dashboard_specs:
-        url_path = spec["url_path"]
-
-        # If Lovelace already knows this dashboard, do nothing.
-        if url_path in lovelace_data.dashboards:
-            continue
-
-        filename = spec["filename"]
-        config_sources: list[Path] = []
-
-        user_path = dashboards_dir / filename
-        if user_path.exists():
-            config_sources.append(user_path)
+    # Candidate sources per dashboard, in preference order (user copy first).
+    spec_sources = [
+        (
+            dashboards_dir / spec["filename"],
+            # Fallback: dashboards bundled with the integration package.
+            PACKAGED_DASHBOARDS_DIR / spec["filename"],
+        )
+        for spec in pending_specs
+    ]
 
-        packaged_path = packaged_dashboards_dir / filename
-        if packaged_path.exists():
-            config_sources.append(packaged_path)
+    def _ensure_dashboards_dir() -> None:
+        try:
+            dashboards_dir.mkdir(parents=True)
+        except FileExistsError:
+            return
+        LOGGER.debug("Created dashboards directory: %s", dashboards_dir)
 
-        if not config_sources:
-            LOGGER.warning(
-                "Solar Cube storage dashboard import skipped for %s: missing %s and %s",
-                url_path,
-                user_path,
-                packaged_path,
-            )
-            continue
+    try:
+        await hass.async_add_executor_job(_ensure_dashboards_dir)
+    except OSError as err:
+        LOGGER.warning(
+            "Solar Cube storage dashboard import skipped: failed to create %s: %s",
+            dashboards_dir,
+            err,
+        )
+        return False
 
-        source_path = None
-        config_dict = None
+    async def _async_load_first(
+        config_sources: list[Path],
+    ) -> tuple[str | None, dict[str, Any] | None, Exception | None, bool]:
+        # Missing candidates are detected by the read itself (no exists()).
         last_err: Exception | None = None
-
+        found = False
         for candidate in config_sources:
             try:
                 config_dict = await hass.async_add_executor_job(
-                    load_yaml_dict,
-                    str(candidate),
-                    Secrets(Path(hass.config.config_dir)),
+                    _load_dashboard_yaml, candidate
                 )
-                source_path = str(candidate)
-                break
-            except FileNotFoundError as err:
-                last_err = err
+            except FileNotFoundError:
                 continue
             except Exception as err:  # noqa: BLE001
+                found = True
                 last_err = err
                 continue
+            return str(candidate), config_dict, None, True
+        return None, None, last_err, found
+
+    # Read all dashboards concurrently; fallback order is kept per dashboard.
+    loaded = await asyncio.gather(
+        *(
+            _async_load_first(list(sources))
+            for sources in spec_sources
+        )
+    )
+
+    for spec, (user_path, packaged_path), (
+        source_path,
+        config_dict,
+        last_err,
+        found,
+    ) in zip(pending_specs, spec_sources, loaded):
+        url_path = spec["url_path"]
+
+        if not found:
+            LOGGER.warning(
+                "Solar Cube storage dashboard import skipped for %s: missing %s and %s",
+                url_path,
+                user_path,
+                packaged_path,
+            )
+            continue
 
         if config_dict is None or source_path is None:
             LOGGER.warning(
@@ -790,6 +1165,20 @@ def _notify_restart_required_fallback(hass: HomeAssistant) -> None:
     )
 
 
+def _parse_dependencies(path: Path) -> list[dict[str, str]]:
+    data = _parse_json(path)
+    if not isinstance(data, list):
+        return []
+    return [
+        {
+            "name": entry.get("name", entry["repository"]),
+            "repository": entry["repository"],
+        }
+        for entry in data
+        if isinstance(entry, dict) and "repository" in entry
+    ]
+
+
 async def _load_dashboard_dependencies(
     hass: HomeAssistant,
 ) -> list[dict[str, str]]:
@@ -830,15 +1219,12 @@ async def _load_dashboard_dependencies(
         },
     ]
 
-    if not DASHBOARD_DEPENDENCIES_PATH.exists():
-        return defaults
-
     try:
-        data = await hass.async_add_executor_job(
-            lambda: json.loads(
-                DASHBOARD_DEPENDENCIES_PATH.read_text(encoding="utf-8")
-            )
+        dependencies = await hass.async_add_executor_job(
+            _cached_parse, DASHBOARD_DEPENDENCIES_PATH, _parse_dependencies
         )
+    except FileNotFoundError:
+        return defaults
     except (OSError, json.JSONDecodeError) as err:
         LOGGER.warning(
             "Failed to read dashboard dependencies from %s: %s",
@@ -847,18 +1233,6 @@ async def _load_dashboard_dependencies(
         )
         return defaults
 
-    dependencies: list[dict[str, str]] = []
-    if isinstance(data, list):
-        for entry in data:
-            if not isinstance(entry, dict) or "repository" not in entry:
-                continue
-            dependencies.append(
-                {
-                    "name": entry.get("name", entry["repository"]),
-                    "repository": entry["repository"],
-                }
-            )
-
     return dependencies or defaults
 
 
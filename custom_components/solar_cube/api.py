@@ -2,15 +2,18 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import csv
 import logging
-from datetime import datetime
-from typing import Any, Dict, List
+import time
+from collections import defaultdict
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List
 
-import influxdb_client
-from influxdb_client.rest import ApiException
+import aiohttp
 
 from homeassistant.util import dt as dt_util
+from homeassistant.util.ssl import get_default_context
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,28 +26,207 @@ class SolarCubeApiRequestError(Exception):
     """Raised when an InfluxDB request fails for non-auth reasons."""
 
 
-FORECAST_QUERY = """from(bucket: {bucket_literal})
-  |> range(start: now(), stop: 32h)
+VALIDATE_QUERY = (
+    "from(bucket: {bucket_literal}) |> range(start: -1m) |> limit(n: 1)"
+)
+
+# Windows start on the hour: truncating the range start keeps the first
+# window (and so the first row's _time) on an hour boundary across refreshes.
+_FLUX_IMPORTS = 'import "date"\n\n'
+
+_FORECAST_PIPELINE = """from(bucket: {bucket_literal})
+  |> range(start: date.truncate(t: now(), unit: 1h), stop: 32h)
   |> filter(fn: (r) => r["_measurement"] == "cs")
-  |> filter(fn: (r) => r["_field"] == "cs/prices/buy_total_price_per_kwh" or r["_field"] == "cs/forecasts/consumption_forecast_kwh" or r["_field"] == "cs/forecasts/production_forecast_kwh" or r["_field"] == "cs/forecasts/soc_forecast" or r["_field"] == "cs/schedule/controller" or r["_field"] == "cs/schedule/target_soc" or r["_field"] == "cs/prices/sell_price_per_kwh")"""
+  |> filter(fn: (r) => r["_field"] == "cs/prices/buy_total_price_per_kwh" or r["_field"] == "cs/forecasts/consumption_forecast_kwh" or r["_field"] == "cs/forecasts/production_forecast_kwh" or r["_field"] == "cs/forecasts/soc_forecast" or r["_field"] == "cs/schedule/controller" or r["_field"] == "cs/schedule/target_soc" or r["_field"] == "cs/prices/sell_price_per_kwh")
+  |> aggregateWindow(every: 1h, fn: last, createEmpty: false, timeSrc: "_start")
+  |> keep(columns: ["_time", "_value", "_field"])
+  |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")"""
 
-OPTIMAL_ACTIONS_QUERY = """from(bucket: {bucket_literal})
-  |> range(start: now(), stop: 32h)
+_ACTIONS_PIPELINE = """from(bucket: {bucket_literal})
+  |> range(start: date.truncate(t: now(), unit: 1h), stop: 32h)
   |> filter(fn: (r) => r["_measurement"] == "cs")
-  |> filter(fn: (r) => r["_field"] == "cs/opt_actions/bc" or r["_field"] == "cs/opt_actions/bg" or r["_field"] == "cs/opt_actions/gb" or r["_field"] == "cs/opt_actions/gc" or r["_field"] == "cs/opt_actions/pb" or r["_field"] == "cs/opt_actions/pc" or r["_field"] == "cs/opt_actions/pg")"""
+  |> filter(fn: (r) => r["_field"] == "cs/opt_actions/bc" or r["_field"] == "cs/opt_actions/bg" or r["_field"] == "cs/opt_actions/gb" or r["_field"] == "cs/opt_actions/gc" or r["_field"] == "cs/opt_actions/pb" or r["_field"] == "cs/opt_actions/pc" or r["_field"] == "cs/opt_actions/pg")
+  |> aggregateWindow(every: 1h, fn: last, createEmpty: false, timeSrc: "_start")
+  |> keep(columns: ["_time", "_value", "_field"])
+  |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")"""
+
+# Influx field -> key used in the rows handed to the sensors.
+FORECAST_FIELD_TO_KEY = {
+    "cs/schedule/controller": "ctr",
+    "cs/schedule/target_soc": "ts",
+    "cs/forecasts/consumption_forecast_kwh": "cf",
+    "cs/forecasts/production_forecast_kwh": "pf",
+    "cs/forecasts/soc_forecast": "sf",
+    "cs/prices/buy_total_price_per_kwh": "bp",
+    "cs/prices/sell_price_per_kwh": "sp",
+}
+ACTIONS_FIELD_TO_KEY = {
+    f"cs/opt_actions/{key}": key
+    for key in ("bc", "bg", "gb", "gc", "pb", "pc", "pg")
+}
+
+# Empty output rows, copied for each new timestamp (key order is kept).
+_FORECAST_ROW: dict[str, Any] = dict.fromkeys(FORECAST_FIELD_TO_KEY.values())
+_ACTIONS_ROW: dict[str, Any] = dict.fromkeys(ACTIONS_FIELD_TO_KEY.values())
+
+# Columns read from the CSV for each query ("result" names the yield).
+_LAST_COLUMNS = frozenset({"_value"})
+_FORECAST_COLUMNS = frozenset({"result", "_time", *FORECAST_FIELD_TO_KEY})
+_ACTIONS_COLUMNS = frozenset({"result", "_time", *ACTIONS_FIELD_TO_KEY})
+
+# Both pipelines in one request; records are told apart by their result name.
+FORECAST_AND_ACTIONS_QUERY = f"""{_FLUX_IMPORTS}{_FORECAST_PIPELINE}
+  |> yield(name: "forecast")
+
+{_ACTIONS_PIPELINE}
+  |> yield(name: "actions")"""
+
+# Same pool size the influxdb-client based implementation used.
+CONNECTION_POOL_SIZE = 64
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# Forecasts and optimal actions change at most hourly; results younger than
+# this (seconds) are served from memory.
+CACHE_TTL_FORECAST = 300
+CACHE_TTL_ACTIONS = 300
+
+# Annotated CSV: ask for the #datatype row so values can be typed.
+_QUERY_DIALECT = {"header": True, "annotations": ["datatype"]}
+
+_CSV_CONVERTERS: dict[str, Callable[[str], Any]] = {
+    "double": float,
+    "long": int,
+    "unsignedLong": int,
+    "boolean": lambda value: value == "true",
+    "dateTime:RFC3339": dt_util.parse_datetime,
+    "dateTime:RFC3339Nano": dt_util.parse_datetime,
+}
+
+
+# Escape sequences Flux understands inside a string literal.
+_FLUX_STR_ESCAPES = str.maketrans(
+    {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+)
+
+# Sessions shared by SolarCubeApi instances with the same (url, token, org),
+# e.g. a config-flow validation while the entry is running; value is
+# (session, number of instances holding it).
+_SHARED_SESSIONS: dict[
+    tuple[str, str, str], tuple[aiohttp.ClientSession, int]
+] = {}
+
+
+def _acquire_session(key: tuple[str, str, str]) -> aiohttp.ClientSession:
+    shared = _SHARED_SESSIONS.get(key)
+    if shared is None or shared[0].closed:
+        session = aiohttp.ClientSession(
+            # HA builds its SSL context once at startup; reusing it keeps
+            # certificate loading off the event loop.
+            connector=aiohttp.TCPConnector(
+                limit=CONNECTION_POOL_SIZE, ssl=get_default_context()
+            ),
+            headers={"Authorization": f"Token {key[1]}"},
+            timeout=REQUEST_TIMEOUT,
+        )
+        refs = 0
+    else:
+        session, refs = shared
+    _SHARED_SESSIONS[key] = (session, refs + 1)
+    return session
+
+
+async def _async_release_session(
+    key: tuple[str, str, str], session: aiohttp.ClientSession
+) -> None:
+    """Drop one reference; the last holder closes the session."""
+    shared = _SHARED_SESSIONS.get(key)
+    if shared is None or shared[0] is not session:
+        # Replaced after it was closed; nothing else holds this one.
+        await session.close()
+        return
+    refs = shared[1] - 1
+    if refs > 0:
+        _SHARED_SESSIONS[key] = (session, refs)
+        return
+    del _SHARED_SESSIONS[key]
+    await session.close()
+
+
+def _parse_annotated_csv(
+    lines: Iterable[str], columns: frozenset[str]
+) -> list[dict[str, Any]]:
+    """Parse an InfluxDB annotated CSV response into one dict per record.
+
+    Only the given columns are read (by index, resolved once per table) and
+    empty cells become None. Tables are separated by blank lines and each one
+    starts with its own #datatype annotation and header row.
+    """
+    records: list[dict[str, Any]] = []
+    datatypes: list[str] = []
+    header: list[str] | None = None
+    selected: list[tuple[int, str, Callable[[str], Any] | None]] = []
+
+    for row in csv.reader(lines):
+        if not any(row):
+            datatypes, header = [], None
+            continue
+        if row[0].startswith("#"):
+            if row[0] == "#datatype":
+                datatypes, header = row, None
+            continue
+        if header is None:
+            header = row
+            selected = [
+                (
+                    index,
+                    name,
+                    _CSV_CONVERTERS.get(datatypes[index])
+                    if index < len(datatypes)
+                    else None,
+                )
+                for index, name in enumerate(header)
+                if name in columns
+            ]
+            continue
+        if header[1:2] == ["error"]:
+            # Errors raised while the query runs are sent as a result table.
+            raise SolarCubeApiRequestError(row[1])
+
+        record: dict[str, Any] = {}
+        for index, name, converter in selected:
+            value = row[index] if index < len(row) else ""
+            if value == "":
+                record[name] = None
+            else:
+                record[name] = converter(value) if converter else value
+        records.append(record)
+
+    return records
 
 
 class SolarCubeApi:
-    """Lightweight wrapper around influxdb-client."""
+    """Lightweight asyncio client for the InfluxDB v2 HTTP API."""
 
     def __init__(self, url: str, token: str, org: str) -> None:
-        self._client = influxdb_client.InfluxDBClient(
-            url=url,
-            token=self._normalize_token(token),
-            org=org,
-            connection_pool_maxsize=64,
-        )
-        self._query_api = self._client.query_api()
+        self._url = (url or "").strip().rstrip("/")
+        self._token = self._normalize_token(token)
+        self._org = org
+        self._session: aiohttp.ClientSession | None = None
+        # (template, bucket) -> formatted Flux; buckets are fixed per entry.
+        self._queries: dict[tuple[str, str], str] = {}
+        # (bucket, timezone) -> in-flight async_get_all fetch.
+        self._inflight: dict[
+            tuple[str, str],
+            asyncio.Task[
+                tuple[list[dict[str, Any]], list[dict[str, Any]]]
+            ],
+        ] = {}
+        # Any successful request proves the credentials; reset on 401.
+        self._validated = False
+        # (bucket, kind, timezone) -> (monotonic time stored, rows)
+        self._cache: dict[
+            tuple[str, str, str], tuple[float, list[dict[str, Any]]]
+        ] = {}
 
     @staticmethod
     def _normalize_token(token: str) -> str:
@@ -57,58 +239,146 @@ class SolarCubeApi:
     @staticmethod
     def _flux_str_literal(value: str) -> str:
         """Return a Flux string literal (double-quoted) for a Python string."""
-        return json.dumps(value)
+        escaped = value.translate(_FLUX_STR_ESCAPES)
+        # "${" would start string interpolation in Flux.
+        return '"' + escaped.replace("${", "\\${") + '"'
 
     def _bucket_literal(self, bucket: str) -> str:
         return self._flux_str_literal((bucket or "").strip())
 
+    def _bucket_query(self, template: str, bucket: str) -> str:
+        """Return template formatted for bucket, built once per bucket."""
+        key = (template, bucket)
+        flux = self._queries.get(key)
+        if flux is None:
+            flux = template.format(bucket_literal=self._bucket_literal(bucket))
+            self._queries[key] = flux
+        return flux
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so it is bound to the running event loop.
+        if self._session is None or self._session.closed:
+            self._session = _acquire_session(
+                (self._url, self._token, self._org)
+            )
+        return self._session
+
+    def _cache_get(
+        self, key: tuple[str, str, str], ttl: float
+    ) -> list[dict[str, Any]] | None:
+        cached = self._cache.get(key)
+        if cached is None or time.monotonic() - cached[0] >= ttl:
+            return None
+        return list(cached[1])
+
+    def _cache_put(
+        self, key: tuple[str, str, str], rows: list[dict[str, Any]]
+    ) -> None:
+        self._cache[key] = (time.monotonic(), rows)
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    async def async_connect(self) -> None:
+        """Set up the HTTP session ahead of the first query."""
+        self._get_session()
+
+    async def async_close(self) -> None:
+        self.clear_cache()
+        if self._session is not None:
+            session, self._session = self._session, None
+            await _async_release_session(
+                (self._url, self._token, self._org), session
+            )
+
+    async def _async_request(
+        self,
+        method: str,
+        path: str,
+        context: str,
+        flux: str | None = None,
+        params: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> list[str]:
+        """Send a request and return the response body as decoded lines.
+
+        Raises SolarCubeApiAuthError on 401 and SolarCubeApiRequestError on
+        any other HTTP or connection error.
+        """
+        try:
+            async with self._get_session().request(
+                method,
+                f"{self._url}{path}",
+                params={"org": self._org, **(params or {})},
+                **kwargs,
+            ) as resp:
+                if resp.status < 400:
+                    # Read line by line as the body streams in.
+                    lines = [
+                        line.decode("utf-8") async for line in resp.content
+                    ]
+                    self._validated = True
+                    return lines
+                body = await resp.text()
+                status, reason = resp.status, resp.reason
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+            # ValueError: over-long line/chunk while streaming, or bad UTF-8.
+            raise SolarCubeApiRequestError(
+                str(err) or type(err).__name__
+            ) from err
+
+        if status == 401:
+            self._validated = False
+            raise SolarCubeApiAuthError("Unauthorized")
+        if status == 400:
+            _LOGGER.error(
+                "InfluxDB rejected Flux (%s). details=%s flux=%s",
+                context,
+                self._response_details(status, reason, body),
+                flux,
+            )
+        raise SolarCubeApiRequestError(f"({status}) Reason: {reason}")
+
+    async def _async_query(
+        self, flux: str, context: str, columns: frozenset[str]
+    ) -> list[dict[str, Any]]:
+        lines = await self._async_request(
+            "POST",
+            "/api/v2/query",
+            context,
+            flux,
+            json={"query": flux, "type": "flux", "dialect": _QUERY_DIALECT},
+            # InfluxDB gzips the CSV when asked; aiohttp decodes it.
+            headers={"Accept": "application/csv", "Accept-Encoding": "gzip"},
+        )
+        return _parse_annotated_csv(lines, columns)
+
     async def async_validate(self, bucket: str | None = None) -> None:
         """Validate credentials by performing an authenticated call.
 
         Prefer validating via a lightweight query when a bucket is known,
         because some tokens might not have permission to list buckets.
+        Returns immediately once any request by this client has succeeded.
         """
-        try:
-            if bucket:
-                flux = (
-                    f"from(bucket: {self._bucket_literal(bucket)}) "
-                    "|> range(start: -1m) "
-                    "|> limit(n: 1)"
-                )
-                _LOGGER.debug(
-                    "Influx validate via query flux=%s (bucket_raw=%r)",
-                    flux,
-                    bucket,
-                )
-                await asyncio.to_thread(self._query_api.query, flux)
-            else:
-                buckets_api = self._client.buckets_api()
-                await asyncio.to_thread(buckets_api.find_buckets)
-        except ApiException as err:
-            if getattr(err, "status", None) == 401:
-                raise SolarCubeApiAuthError("Unauthorized") from err
-            if getattr(err, "status", None) == 400:
-                _LOGGER.error(
-                    "InfluxDB rejected Flux (validate). details=%s",
-                    self._api_exception_details(err),
-                )
-            raise SolarCubeApiRequestError(str(err)) from err
-
-    def close(self) -> None:
-        self._client.close()
+        if self._validated:
+            return
+        if bucket:
+            flux = self._bucket_query(VALIDATE_QUERY, bucket)
+            _LOGGER.debug(
+                "Influx validate via query flux=%s (bucket_raw=%r)",
+                flux,
+                bucket,
+            )
+            await self._async_query(flux, "validate", frozenset())
+        else:
+            await self._async_request(
+                "GET", "/api/v2/buckets", "validate", params={"limit": 1}
+            )
 
     @staticmethod
-    def _api_exception_details(err: ApiException) -> str:
-        status = getattr(err, "status", None)
-        reason = getattr(err, "reason", None)
-        body = getattr(err, "body", None)
+    def _response_details(status: int, reason: str | None, body: str) -> str:
         # Keep log lines bounded.
-        if isinstance(body, (bytes, bytearray)):
-            try:
-                body = body.decode("utf-8", errors="replace")
-            except Exception:  # noqa: BLE001
-                body = str(body)
-        if isinstance(body, str) and len(body) > 800:
+        if len(body) > 800:
             body = body[:800] + "…"
         return f"status={status} reason={reason} body={body!r}"
 
@@ -129,150 +399,155 @@ class SolarCubeApi:
             f'|> filter(fn: (r) => r["_field"] == {field_literal}) '
             "|> last()"
         )
-        try:
-            _LOGGER.debug(
-                "Influx query_last flux=%s (bucket_raw=%r)",
-                flux,
-                bucket,
-            )
-            result = await asyncio.to_thread(self._query_api.query, flux)
-        except ApiException as err:
-            if getattr(err, "status", None) == 401:
-                raise SolarCubeApiAuthError("Unauthorized") from err
-            if getattr(err, "status", None) == 400:
-                _LOGGER.error(
-                    "InfluxDB rejected Flux (query_last). details=%s flux=%s",
-                    self._api_exception_details(err),
-                    flux,
-                )
-            raise SolarCubeApiRequestError(str(err)) from err
-        for table in result:
-            for record in table.records:
-                return record.get_value()
+        _LOGGER.debug(
+            "Influx query_last flux=%s (bucket_raw=%r)",
+            flux,
+            bucket,
+        )
+        records = await self._async_query(flux, "query_last", _LAST_COLUMNS)
+        for record in records:
+            return record.get("_value")
         return None
 
     async def async_get_forecast(
         self, bucket: str, hass_timezone: str
     ) -> list[dict[str, Any]]:
-        try:
-            flux = FORECAST_QUERY.format(
-                bucket_literal=self._bucket_literal(bucket)
-            )
-            _LOGGER.debug(
-                "Influx forecast flux=%s (bucket_raw=%r)",
-                flux,
-                bucket,
-            )
-            result = await asyncio.to_thread(self._query_api.query, flux)
-        except ApiException as err:
-            if getattr(err, "status", None) == 401:
-                raise SolarCubeApiAuthError("Unauthorized") from err
-            if getattr(err, "status", None) == 400:
-                _LOGGER.error(
-                    "InfluxDB rejected Flux (forecast). details=%s flux=%s",
-                    self._api_exception_details(err),
-                    FORECAST_QUERY.format(
-                        bucket_literal=self._bucket_literal(bucket)
-                    ),
-                )
-            raise SolarCubeApiRequestError(str(err)) from err
-        tz = dt_util.get_time_zone(hass_timezone)
-        forecast_data: Dict[str, Dict[str, Any]] = {}
-
-        for table in result:
-            for record in table.records:
-                record_time = record.get_time()
-                if isinstance(record_time, str):
-                    record_time = datetime.fromisoformat(record_time)
-                local_time = record_time.astimezone(tz)
-                hour_key = local_time.isoformat()
-                if hour_key not in forecast_data:
-                    forecast_data[hour_key] = {
-                        "ctr": None,
-                        "ts": None,
-                        "cf": None,
-                        "pf": None,
-                        "sf": None,
-                        "bp": None,
-                        "sp": None,
-                    }
-                value = record.get_value()
-                if isinstance(value, (float, int)):
-                    value = round(value, 3)
-                field = record.get_field()
-                if field == "cs/schedule/controller":
-                    forecast_data[hour_key]["ctr"] = value
-                elif field == "cs/schedule/target_soc":
-                    forecast_data[hour_key]["ts"] = value
-                elif field == "cs/forecasts/consumption_forecast_kwh":
-                    forecast_data[hour_key]["cf"] = value
-                elif field == "cs/forecasts/production_forecast_kwh":
-                    forecast_data[hour_key]["pf"] = value
-                elif field == "cs/forecasts/soc_forecast":
-                    forecast_data[hour_key]["sf"] = value
-                elif field == "cs/prices/buy_total_price_per_kwh":
-                    forecast_data[hour_key]["bp"] = value
-                elif field == "cs/prices/sell_price_per_kwh":
-                    forecast_data[hour_key]["sp"] = value
-
-        return [
-            {"dt": hour_key, **data}
-            for hour_key, data in sorted(forecast_data.items())
-        ]
+        forecast, _ = await self.async_get_forecast_and_actions(
+            bucket, hass_timezone
+        )
+        return forecast
 
     async def async_get_optimal_actions(
         self, bucket: str, hass_timezone: str
     ) -> List[dict[str, Any]]:
-        try:
-            flux = OPTIMAL_ACTIONS_QUERY.format(
-                bucket_literal=self._bucket_literal(bucket)
+        _, actions = await self.async_get_forecast_and_actions(
+            bucket, hass_timezone
+        )
+        return actions
+
+    async def async_get_forecast_and_actions(
+        self, bucket: str, hass_timezone: str
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Fetch forecast and optimal actions in a single Flux request."""
+        forecast_key = (bucket, "forecast", hass_timezone)
+        actions_key = (bucket, "actions", hass_timezone)
+        cached_forecast = self._cache_get(forecast_key, CACHE_TTL_FORECAST)
+        cached_actions = self._cache_get(actions_key, CACHE_TTL_ACTIONS)
+        if cached_forecast is not None and cached_actions is not None:
+            return cached_forecast, cached_actions
+
+        flux = self._bucket_query(FORECAST_AND_ACTIONS_QUERY, bucket)
+        _LOGGER.debug(
+            "Influx forecast_and_actions flux=%s (bucket_raw=%r)",
+            flux,
+            bucket,
+        )
+        records = await self._async_query(
+            flux,
+            "forecast_and_actions",
+            _FORECAST_COLUMNS | _ACTIONS_COLUMNS,
+        )
+        tz = _get_tz(hass_timezone)
+        forecast = _aggregate_forecast(
+            [r for r in records if r.get("result") == "forecast"], tz
+        )
+        actions = _aggregate_actions(
+            [r for r in records if r.get("result") == "actions"], tz
+        )
+        self._cache_put(forecast_key, forecast)
+        self._cache_put(actions_key, actions)
+        return list(forecast), list(actions)
+
+    async def async_get_all(
+        self, bucket: str, hass_timezone: str
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Return (forecast, optimal actions), sharing one in-flight fetch.
+
+        Concurrent callers for the same bucket and timezone (the forecast and
+        optimal-actions coordinators) wait on the same request.
+        """
+        key = (bucket, hass_timezone)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self.async_get_forecast_and_actions(bucket, hass_timezone)
             )
-            _LOGGER.debug(
-                "Influx optimal_actions flux=%s (bucket_raw=%r)",
-                flux,
-                bucket,
+            self._inflight[key] = task
+            task.add_done_callback(
+                lambda done: self._inflight_done(key, done)
             )
-            result = await asyncio.to_thread(self._query_api.query, flux)
-        except ApiException as err:
-            if getattr(err, "status", None) == 401:
-                raise SolarCubeApiAuthError("Unauthorized") from err
-            if getattr(err, "status", None) == 400:
-                _LOGGER.error(
-                    "InfluxDB rejected Flux (optimal_actions). details=%s flux=%s",
-                    self._api_exception_details(err),
-                    OPTIMAL_ACTIONS_QUERY.format(
-                        bucket_literal=self._bucket_literal(bucket)
-                    ),
-                )
-            raise SolarCubeApiRequestError(str(err)) from err
-        tz = dt_util.get_time_zone(hass_timezone)
-        actions: Dict[str, Dict[str, Any]] = {}
-
-        for table in result:
-            for record in table.records:
-                record_time = record.get_time()
-                if isinstance(record_time, str):
-                    record_time = datetime.fromisoformat(record_time)
-                local_time = record_time.astimezone(tz)
-                hour_key = local_time.isoformat()
-                if hour_key not in actions:
-                    actions[hour_key] = {
-                        "bc": None,
-                        "bg": None,
-                        "gb": None,
-                        "gc": None,
-                        "pb": None,
-                        "pc": None,
-                        "pg": None,
-                    }
-                value = record.get_value()
-                if isinstance(value, (float, int)):
-                    value = round(value, 3)
-                field = record.get_field()
-                short_key = field.split("/")[-1]
-                actions[hour_key][short_key] = value
-
-        return [
-            {"dt": hour_key, **data}
-            for hour_key, data in sorted(actions.items())
-        ]
+        # Shielded: one caller giving up must not cancel the others' fetch.
+        forecast, actions = await asyncio.shield(task)
+        return list(forecast), list(actions)
+
+    def _inflight_done(self, key: tuple[str, str], task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller went away.
+            task.exception()
+
+
+@lru_cache(maxsize=8)
+def _get_tz(name: str) -> tzinfo | None:
+    """Return the tzinfo for an HA time zone name (None if unknown)."""
+    return dt_util.get_time_zone(name)
+
+
+def _round_row(row: dict[str, Any]) -> dict[str, Any]:
+    """Round the numeric values of an output row to 3 decimals."""
+    return {
+        key: (
+            round(value, 3)
+            if isinstance(value, (float, int)) and not isinstance(value, bool)
+            else value
+        )
+        for key, value in row.items()
+    }
+
+
+def _aggregate_forecast(
+    records: list[dict[str, Any]], tz: tzinfo | None
+) -> list[dict[str, Any]]:
+    """Build one forecast row per timestamp from pivoted records."""
+    # Keyed by the UTC timestamp; converted to local time once per row below.
+    forecast_data: Dict[datetime, Dict[str, Any]] = defaultdict(
+        _FORECAST_ROW.copy
+    )
+
+    for record in records:
+        # _time is annotated as a dateTime type, so _CSV_CONVERTERS has
+        # already parsed it into a datetime.
+        row = forecast_data[record["_time"]]
+        # Each pivoted record carries all forecast fields as columns; series
+        # split over several tables leave the missing ones empty.
+        for field, key in FORECAST_FIELD_TO_KEY.items():
+            value = record.get(field)
+            if value is not None:
+                row[key] = value
+
+    # Sorted on the UTC timestamps; the local ISO strings would misorder
+    # rows around DST changes.
+    return [
+        {"dt": record_time.astimezone(tz).isoformat(), **_round_row(data)}
+        for record_time, data in sorted(forecast_data.items())
+    ]
+
+
+def _aggregate_actions(
+    records: list[dict[str, Any]], tz: tzinfo | None
+) -> list[dict[str, Any]]:
+    """Build one optimal-actions row per timestamp from pivoted records."""
+    actions: Dict[datetime, Dict[str, Any]] = defaultdict(_ACTIONS_ROW.copy)
+
+    for record in records:
+        row = actions[record["_time"]]
+        for field, key in ACTIONS_FIELD_TO_KEY.items():
+            value = record.get(field)
+            if value is not None:
+                row[key] = value
+
+    return [
+        {"dt": record_time.astimezone(tz).isoformat(), **_round_row(data)}
+        for record_time, data in sorted(actions.items())
+    ]
@@ -95,7 +95,7 @@ class SolarCubeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     errors["base"] = "unknown"
                 finally:
                     try:
-                        api.close()
+                        await api.async_close()
                     except Exception:  # noqa: BLE001
                         pass
 
@@ -180,7 +180,7 @@ class SolarCubeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "unknown"
             finally:
                 try:
-                    api.close()
+                    await api.async_close()
                 except Exception:  # noqa: BLE001
                     pass
 
@@ -243,7 +243,7 @@ class SolarCubeOptionsFlowHandler(config_entries.OptionsFlow):
                 errors["base"] = "unknown"
             finally:
                 try:
-                    api.close()
+                    await api.async_close()
                 except Exception:  # noqa: BLE001
                     pass
 
@@ -22,11 +22,59 @@ DASHBOARD_FILES = {
     "solar-cube-forecasts": "forecasts_solar_cube_pl.yaml",
 }
 
+# Storage-mode dashboards created on import, per UI language (English is the
+# fallback). URL paths must be slug-like and contain a hyphen.
+STORAGE_DASHBOARD_SPECS: dict[str, tuple[dict[str, str], ...]] = {
+    "pl": (
+        {
+            "url_path": "panel-solar-cube",
+            "title": "Solar Cube",
+            "icon": "mdi:solar-panel",
+            "filename": "panel_solar_cube_pl.yaml",
+        },
+        {
+            "url_path": "historia-solar-cube",
+            "title": "Solar Cube Historia",
+            "icon": "mdi:history",
+            "filename": "history_solar_cube_pl.yaml",
+        },
+        {
+            "url_path": "prognozy-solar-cube",
+            "title": "Solar Cube Prognozy",
+            "icon": "mdi:weather-sunny-alert",
+            "filename": "forecasts_solar_cube_pl.yaml",
+        },
+    ),
+    "en": (
+        {
+            "url_path": "panel-solar-cube",
+            "title": "Solar Cube",
+            "icon": "mdi:solar-panel",
+            "filename": "panel_solar_cube_en.yaml",
+        },
+        {
+            "url_path": "historia-solar-cube",
+            "title": "Solar Cube History",
+            "icon": "mdi:history",
+            "filename": "history_solar_cube_en.yaml",
+        },
+        {
+            "url_path": "prognozy-solar-cube",
+            "title": "Solar Cube Forecasts",
+            "icon": "mdi:weather-sunny-alert",
+            "filename": "forecasts_solar_cube_en.yaml",
+        },
+    ),
+}
+
 # Dashboards and dependencies are bundled with the integration so they are available
 # even when installed via HACS (which typically installs only custom_components/*).
-DASHBOARD_DEPENDENCIES_PATH = (
-    Path(__file__).parent / "dashboards" / "dependencies.json"
-)
+PACKAGE_DIR = Path(__file__).parent
+PACKAGED_DASHBOARDS_DIR = PACKAGE_DIR / "dashboards"
+DASHBOARD_DEPENDENCIES_PATH = PACKAGED_DASHBOARDS_DIR / "dependencies.json"
+AUTOMATIONS_TEMPLATE_PATH = PACKAGED_DASHBOARDS_DIR / "automations.yaml"
+ENERGY_TEMPLATE_PATH = PACKAGED_DASHBOARDS_DIR / "energy.json"
+INSTALLER_SCRIPT_PATH = PACKAGE_DIR / "tools" / "install_frontend_deps.sh"
 
 UPDATE_INTERVAL = timedelta(seconds=30)
 FORECAST_UPDATE_INTERVAL = timedelta(minutes=30)
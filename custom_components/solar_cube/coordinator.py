@@ -97,10 +97,11 @@ class SolarCubeForecastCoordinator(
 
     async def _async_update_data(self) -> list[dict[str, Any]]:
         try:
-            return await self.api.async_get_forecast(
+            forecast, _ = await self.api.async_get_all(
                 bucket=self.entry_data[CONF_AGENTS_BUCKET],
                 hass_timezone=self.hass.config.time_zone,
             )
+            return forecast
         except SolarCubeApiAuthError as err:
             raise ConfigEntryAuthFailed("InfluxDB unauthorized") from err
         except SolarCubeApiRequestError as err:
@@ -129,10 +130,11 @@ class SolarCubeOptimalActionsCoordinator(
 
     async def _async_update_data(self) -> list[dict[str, Any]]:
         try:
-            return await self.api.async_get_optimal_actions(
+            _, actions = await self.api.async_get_all(
                 bucket=self.entry_data[CONF_AGENTS_BUCKET],
                 hass_timezone=self.hass.config.time_zone,
             )
+            return actions
         except SolarCubeApiAuthError as err:
             raise ConfigEntryAuthFailed("InfluxDB unauthorized") from err
         except SolarCubeApiRequestError as err:
@@ -0,0 +1,566 @@
+"""In-process port of tools/install_frontend_deps.sh.
+
+Downloads the pinned Lovelace card releases into /config/www/solar_cube and
+registers them in .storage/lovelace_resources. Everything here is blocking and
+must run in the executor.
+"""
+from __future__ import annotations
+
+import gzip
+import http.client
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+import urllib.request
+import uuid
+import zipfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .const import PACKAGE_DIR
+
+_LOGGER = logging.getLogger(__name__)
+
+# sha256 of the tools/install_frontend_deps.sh revision this module mirrors.
+# A script with different content (e.g. edited locally) is run as-is instead.
+INSTALLER_SCRIPT_SHA256 = (
+    "2689d8e557eec6226962c896cf68bc843bb04a8323b9d72207fc03c6e95a3291"
+)
+
+USER_AGENT = "solar-cube-installer"
+HTTP_TIMEOUT = 60
+
+# (repository, release tag or None for the default-branch archive, folder, asset regex)
+FRONTEND_DEPENDENCIES: tuple[tuple[str, str | None, str, str], ...] = (
+    (
+        "kalkih/mini-graph-card",
+        "v0.13.0",
+        "mini-graph-card",
+        r"mini-graph-card.*\.js(\.gz)?$",
+    ),
+    (
+        "flixlix/power-flow-card-plus",
+        "v0.2.6",
+        "power-flow-card-plus",
+        r"power-flow-card-plus.*\.js(\.gz)?$",
+    ),
+    (
+        "rejuvenate/lovelace-horizon-card",
+        "v1.4.0",
+        "lovelace-horizon-card",
+        r"(lovelace-horizon-card|horizon).*\.js(\.gz)?$",
+    ),
+    (
+        "totaldebug/atomic-calendar-revive",
+        "v10.0.0",
+        "atomic-calendar-revive",
+        r"atomic-calendar-revive.*\.js(\.gz)?$",
+    ),
+    (
+        "mlamberts78/weather-chart-card",
+        "V2.4.11",
+        "weather-chart-card",
+        r"weather-chart-card.*\.js(\.gz)?$",
+    ),
+    (
+        "flixlix/energy-flow-card-plus",
+        "v0.1.2.1",
+        "energy-flow-card-plus",
+        r"energy-flow-card-plus.*\.js(\.gz)?$",
+    ),
+    (
+        "SpangleLabs/history-explorer-card",
+        "v1.0.54",
+        "history-explorer-card",
+        r"history-explorer-card.*\.js(\.gz)?$",
+    ),
+    (
+        "hulkhaugen/hass-bha-icons",
+        None,
+        "hass-bha-icons",
+        r"(bha|hass-bha).*icons.*\.js(\.gz)?$",
+    ),
+    (
+        "MrBartusek/MeteoalarmCard",
+        "v2.7.2",
+        "meteoalarm-card",
+        r"meteoalarm.*\.js(\.gz)?$",
+    ),
+    (
+        "flixlix/energy-period-selector-plus",
+        "v0.2.3",
+        "energy-period-selector-plus",
+        r"energy-period-selector-plus.*\.js(\.gz)?$",
+    ),
+    (
+        "zeronounours/lovelace-energy-entity-row",
+        "v1.2.0",
+        "energy-entity-row",
+        r"energy-entity-row.*\.js(\.gz)?$",
+    ),
+    (
+        "RomRider/apexcharts-card",
+        "v2.2.3",
+        "apexcharts-card",
+        r"apexcharts-card.*\.js(\.gz)?$",
+    ),
+)
+
+_LOVELACE_YAML_MODE = re.compile(
+    r"(?ms)^lovelace\s*:\s*\n(?:^\s+.*\n)*?^\s*mode\s*:\s*yaml\s*$"
+)
+
+
+class _InstallError(Exception):
+    """Raised when a single dependency cannot be installed."""
+
+
+def _urlopen(url: str):
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    return urllib.request.urlopen(req, timeout=HTTP_TIMEOUT)  # noqa: S310
+
+
+def _download_to(url: str, out: Path) -> None:
+    with _urlopen(url) as resp, open(out, "wb") as out_file:
+        shutil.copyfileobj(resp, out_file)
+
+
+def _github_json(path: str) -> Any:
+    with _urlopen(f"https://api.github.com/{path}") as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+
+def _tag_variants(tag: str) -> list[str]:
+    if tag.startswith("v"):
+        return [tag, f"V{tag[1:]}", tag[1:]]
+    if tag.startswith("V"):
+        return [tag, f"v{tag[1:]}", tag[1:]]
+    return [tag, f"v{tag}", f"V{tag}"]
+
+
+def _release_asset_url(repo: str, tag: str, name_re: str) -> str | None:
+    try:
+        release = _github_json(f"repos/{repo}/releases/tags/{tag}")
+    except (OSError, ValueError, http.client.HTTPException):
+        # Tag name might differ (e.g. vX.Y.Z vs VX.Y.Z) or there might be no release.
+        return None
+    if not isinstance(release, dict):
+        return None
+
+    assets = [
+        asset
+        for asset in release.get("assets") or []
+        if isinstance(asset, dict) and asset.get("browser_download_url")
+    ]
+    pattern = re.compile(name_re)
+
+    def _pick(pred: Callable[[str], bool]) -> str | None:
+        for asset in assets:
+            if pred(asset.get("name") or ""):
+                return asset["browser_download_url"]
+        return None
+
+    # Prefer matching regex, then .js (or .js.gz), then .zip, then any asset.
+    return (
+        _pick(lambda n: bool(pattern.search(n)))
+        or _pick(lambda n: n.endswith((".js", ".js.gz")))
+        or _pick(lambda n: n.endswith(".zip"))
+        or (assets[0]["browser_download_url"] if assets else None)
+    )
+
+
+def _gunzip_if_needed(path: Path) -> Path:
+    if path.suffix != ".gz":
+        return path
+    out = path.with_suffix("")
+    with gzip.open(path, "rb") as src, open(out, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    path.unlink()
+    return out
+
+
+def _extract_best_js_from_zip(
+    zip_path: Path, name_re: str, out_path: Path
+) -> Path:
+    pattern = re.compile(name_re)
+    with zipfile.ZipFile(zip_path) as archive:
+        names = archive.namelist()
+        js = [n for n in names if n.lower().endswith(".js")]
+        js_gz = [n for n in names if n.lower().endswith(".js.gz")]
+
+        def _pick(candidates: list[str]) -> str | None:
+            for name in candidates:
+                base = name.rsplit("/", 1)[-1]
+                if pattern.search(base) or pattern.search(name):
+                    return name
+            return candidates[0] if candidates else None
+
+        chosen = _pick(js) or _pick(js_gz)
+        if not chosen:
+            raise _InstallError(f"No JavaScript file found in {zip_path.name}")
+
+        if chosen.lower().endswith(".gz"):
+            out_path = out_path.with_name(out_path.name + ".gz")
+        out_path.write_bytes(archive.read(chosen))
+    return out_path
+
+
+class _Installer:
+    """State shared by one run of the installer (mirrors the shell globals)."""
+
+    def __init__(self, config_dir: Path, version: str) -> None:
+        self.config_dir = config_dir
+        self.community_dir = config_dir / "www" / "solar_cube"
+        self.tmp_dir = Path(tempfile.gettempdir()) / "solar_cube_frontend_deps"
+        self.version = version
+        self.stdout: list[str] = []
+        self.stderr: list[str] = []
+
+    def log(self, message: str) -> None:
+        self.stderr.append(message)
+
+    def warn(self, message: str) -> None:
+        self.stderr.append(f"WARN: {message}")
+
+    def err(self, message: str) -> None:
+        self.stderr.append(f"ERROR: {message}")
+
+    def _installed_url(self, folder: str, installed: Path) -> str:
+        installed = _gunzip_if_needed(installed)
+        self.log(f"Installed: /local/solar_cube/{folder}/{installed.name}")
+        return f"/local/solar_cube/{folder}/{installed.name}?v={self.version}"
+
+    def _install_archive(
+        self, url: str, label: str, folder: str, js_re: str
+    ) -> str:
+        target_dir = self.community_dir / folder
+        target_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.tmp_dir / f"{folder}-{label}.zip"
+        try:
+            _download_to(url, tmp)
+            installed = _extract_best_js_from_zip(
+                tmp, js_re, target_dir / f"{folder}.js"
+            )
+        finally:
+            tmp.unlink(missing_ok=True)
+        return self._installed_url(folder, installed)
+
+    def install_release(
+        self, repo: str, tag: str, folder: str, js_re: str
+    ) -> str:
+        url = None
+        chosen_tag = tag
+        for variant in _tag_variants(tag):
+            url = _release_asset_url(repo, variant, js_re)
+            if url:
+                chosen_tag = variant
+                break
+
+        if not url:
+            # No release assets (or no GitHub Release). Fall back to the tag archive zip.
+            for variant in _tag_variants(tag):
+                self.log(f"Downloading {repo} tag archive {variant}")
+                try:
+                    return self._install_archive(
+                        f"https://github.com/{repo}/archive/refs/tags/{variant}.zip",
+                        variant,
+                        folder,
+                        js_re,
+                    )
+                except (
+                    OSError,
+                    http.client.HTTPException,
+                    zipfile.BadZipFile,
+                    _InstallError,
+                ):
+                    continue
+            raise _InstallError(
+                f"No release asset URL found for {repo}@{tag} and tag archive fallback failed"
+            )
+
+        target_dir = self.community_dir / folder
+        target_dir.mkdir(parents=True, exist_ok=True)
+        name = url.rsplit("/", 1)[-1]
+        tmp = self.tmp_dir / f"{folder}-{chosen_tag}-{name}"
+        self.log(f"Downloading {repo}@{chosen_tag} → {name}")
+        try:
+            _download_to(url, tmp)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+        if name.endswith(".zip"):
+            # Extract the best matching JS.
+            try:
+                installed = _extract_best_js_from_zip(
+                    tmp, js_re, target_dir / f"{folder}.js"
+                )
+            finally:
+                tmp.unlink(missing_ok=True)
+        else:
+            if not name.endswith((".js", ".js.gz")):
+                self.warn(
+                    f"Unknown asset type for {repo}@{tag} ({name}); saving raw file"
+                )
+            installed = target_dir / name
+            shutil.move(tmp, installed)
+
+        return self._installed_url(folder, installed)
+
+    def install_repo_archive(self, repo: str, folder: str, js_re: str) -> str:
+        try:
+            branch = (
+                _github_json(f"repos/{repo}").get("default_branch") or "main"
+            )
+        except (
+            OSError,
+            ValueError,
+            AttributeError,
+            http.client.HTTPException,
+        ):
+            branch = "main"
+        self.log(f"Downloading {repo}@{branch} archive")
+        return self._install_archive(
+            f"https://github.com/{repo}/archive/refs/heads/{branch}.zip",
+            branch,
+            folder,
+            js_re,
+        )
+
+    def _is_lovelace_yaml_mode(self) -> bool:
+        # Extremely simple detection: good enough for user messaging.
+        try:
+            text = (self.config_dir / "configuration.yaml").read_text(
+                encoding="utf-8"
+            )
+        except OSError:
+            return False
+        return bool(_LOVELACE_YAML_MODE.search(text))
+
+    def _ensure_storage_resources_file(self) -> Path | None:
+        storage_dir = self.config_dir / ".storage"
+        storage_file = storage_dir / "lovelace_resources"
+        try:
+            storage_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return None
+        if storage_file.exists():
+            return storage_file
+
+        # If Lovelace is running in YAML mode, .storage resources may not be used.
+        if self._is_lovelace_yaml_mode():
+            self.warn(
+                "Lovelace appears to be in YAML mode (configuration.yaml: lovelace: mode: yaml)."
+            )
+            self.warn(
+                "Dashboard Resources are then configured in ui-lovelace YAML, not /config/.storage/lovelace_resources."
+            )
+            return None
+
+        # Create a minimal Store-compatible skeleton.
+        tmp = self.tmp_dir / "lovelace_resources.new"
+        tmp.write_text(
+            json.dumps(
+                {
+                    "version": 1,
+                    "minor_version": 1,
+                    "key": "lovelace_resources",
+                    "data": {"items": []},
+                },
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        shutil.move(tmp, storage_file)
+        return storage_file
+
+    def _add_resources(self, storage_path: Path, urls: list[str]) -> str:
+        raw = storage_path.read_text(encoding="utf-8")
+        data = json.loads(raw) if raw.strip() else {}
+
+        items = None
+        if isinstance(data, dict):
+            inner = data.get("data")
+            if isinstance(inner, dict) and isinstance(inner.get("items"), list):
+                items = inner["items"]
+            elif isinstance(inner, list):
+                items = inner
+            elif isinstance(data.get("items"), list):
+                items = data["items"]
+        if items is None:
+            raise _InstallError(
+                "Unsupported lovelace_resources format; leaving manual steps"
+            )
+
+        existing_urls: set[str] = set()
+        existing_ids_int: list[int] = []
+        repair_urls: list[str] = []
+        changed = False
+
+        # Repair any existing broken entries where a single "url" contains multiple URLs.
+        repaired_items = []
+        for item in items:
+            if not isinstance(item, dict):
+                repaired_items.append(item)
+                continue
+            url = item.get("url")
+            if isinstance(item.get("id"), int):
+                existing_ids_int.append(item["id"])
+            if isinstance(url, str) and ("\n" in url or "\\n" in url):
+                # Drop the broken multi-url entry; recreate per-URL items below.
+                text = url.replace("\\n", "\n")
+                repair_urls.extend(
+                    p.strip() for p in text.splitlines() if p.strip()
+                )
+                changed = True
+                continue
+            if isinstance(url, str):
+                existing_urls.add(url)
+            repaired_items.append(item)
+        items[:] = repaired_items
+
+        next_int_id = max(existing_ids_int) + 1 if existing_ids_int else 1
+        added = 0
+        for url in repair_urls + urls:
+            if url in existing_urls:
+                continue
+            if existing_ids_int:
+                rid: int | str = next_int_id
+                next_int_id += 1
+            else:
+                rid = uuid.uuid4().hex
+            items.append({"id": rid, "type": "module", "url": url})
+            existing_urls.add(url)
+            added += 1
+
+        if added or changed:
+            backup_path = storage_path.with_name(
+                f"{storage_path.name}.bak.{int(time.time())}"
+            )
+            backup_path.write_text(raw, encoding="utf-8")
+
+            fd, tmp_name = tempfile.mkstemp(
+                dir=storage_path.parent,
+                prefix=".lovelace_resources.",
+                suffix=".tmp",
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                    json.dump(data, tmp_file, ensure_ascii=False, indent=2)
+                    tmp_file.write("\n")
+                os.replace(tmp_name, storage_path)
+            finally:
+                try:
+                    os.remove(tmp_name)
+                except OSError:
+                    pass
+
+        if changed and added:
+            return f"Repaired resources file and added {added} resource(s)"
+        if changed:
+            return "Repaired resources file"
+        return f"Added {added} resource(s)"
+
+    def run(self) -> int:
+        self.community_dir.mkdir(parents=True, exist_ok=True)
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+
+        self.log(
+            f"Solar Cube: installing pinned frontend dependencies into {self.community_dir}"
+        )
+
+        failures = 0
+        resource_urls: list[str] = []
+        for repo, tag, folder, js_re in FRONTEND_DEPENDENCIES:
+            try:
+                if tag is None:
+                    url = self.install_repo_archive(repo, folder, js_re)
+                else:
+                    url = self.install_release(repo, tag, folder, js_re)
+            except (
+                OSError,
+                http.client.HTTPException,
+                zipfile.BadZipFile,
+                _InstallError,
+            ) as err:
+                self.err(f"{repo}: {err}")
+                failures += 1
+                continue
+            resource_urls.append(url)
+
+        self.log("")
+        self.log("Next steps (manual):")
+        self.log(
+            "- Home Assistant → Settings → Dashboards → Resources → Add resource"
+        )
+        self.log("- Type: JavaScript module")
+        self.log("- Add these URLs:")
+        self.stderr.extend(f"- {url}" for url in resource_urls)
+        self.log("- Reload the browser page (hard refresh) after adding resources")
+
+        # Best-effort automation: update HA storage directly.
+        # NOTE: Home Assistant may overwrite this file while running; this is not an official/public API.
+        storage_file = self._ensure_storage_resources_file()
+        if storage_file is not None and resource_urls:
+            self.log("")
+            self.log(f"Attempting to auto-add resources in: {storage_file}")
+            try:
+                self.stdout.append(
+                    self._add_resources(storage_file, resource_urls)
+                )
+            except (OSError, ValueError, _InstallError) as err:
+                self.stderr.append(str(err))
+                self.warn("Auto-add failed; keep using the manual steps above.")
+            else:
+                self.log(
+                    "Auto-add completed. If cards still don’t load, restart Home Assistant and hard refresh the browser."
+                )
+        else:
+            self.warn(
+                f"HA resource storage file not found at {self.config_dir}/.storage/lovelace_resources; keep using the manual steps above."
+            )
+
+        if failures:
+            self.err(
+                f"Some downloads failed ({failures}). Check network access and Home Assistant logs."
+            )
+            return 1
+        return 0
+
+
+def _manifest_version() -> str:
+    # Resource URL version for cache-busting; fall back to a timestamp.
+    try:
+        manifest = json.loads(
+            (PACKAGE_DIR / "manifest.json").read_text(encoding="utf-8")
+        )
+        version = manifest.get("version") or ""
+    except (OSError, ValueError, AttributeError):
+        version = ""
+    return version or time.strftime("%Y.%m.%d.%H%M%S")
+
+
+def install_frontend_deps(config_dir: str) -> tuple[int, str, str]:
+    """Run the installer and return (returncode, stdout, stderr) like the script."""
+    installer = _Installer(Path(config_dir), _manifest_version())
+    try:
+        rc = installer.run()
+    except Exception as err:  # noqa: BLE001
+        # Any failure must still end with a nonzero code, like the script, so
+        # the caller reports it and clears the one-shot option.
+        _LOGGER.exception("Solar Cube frontend installer failed")
+        installer.err(f"{type(err).__name__}: {err}")
+        rc = 1
+    stdout = "\n".join(installer.stdout)
+    stderr = "\n".join(installer.stderr)
+    return (
+        rc,
+        stdout + "\n" if stdout else "",
+        stderr + "\n" if stderr else "",
+    )
@@ -0,0 +1,88 @@
+"""Pre-serialize the shipped dashboard YAML files.
+
+Run after editing anything under custom_components/solar_cube/dashboards/:
+
+    python custom_components/solar_cube/tools/bake_dashboards.py
+
+automations.yaml is baked into the importable _automations_data.py module; every
+other <name>.yaml gets a <name>.json sidecar next to it. Both carry a hash of
+the YAML bytes, and at runtime the integration only uses them while that hash
+still matches, so stale output falls back to parsing the YAML.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import pprint
+import sys
+from pathlib import Path
+
+import yaml
+
+DASHBOARDS_DIR = Path(__file__).resolve().parent.parent / "dashboards"
+
+# YAML files baked into Python modules instead of JSON sidecars.
+PYTHON_MODULES = {"automations.yaml": ("_automations_data.py", "AUTOMATIONS")}
+
+PYTHON_MODULE_TEMPLATE = '''"""Generated by tools/bake_dashboards.py from {source}; do not edit."""
+from __future__ import annotations
+
+from typing import Any
+
+SOURCE_HASH = "{source_hash}"
+
+{name}: list[dict[str, Any]] = {data}
+'''
+
+
+def source_hash(raw: bytes) -> str:
+    """Return the hash stored in baked output (must match the integration)."""
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def bake_json_sidecar(yaml_path: Path) -> Path:
+    raw = yaml_path.read_bytes()
+    data = yaml.safe_load(raw)
+    out_path = yaml_path.with_suffix(".json")
+    out_path.write_text(
+        json.dumps(
+            {"_source_hash": source_hash(raw), "data": data},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    return out_path
+
+
+def bake_python_module(yaml_path: Path, filename: str, name: str) -> Path:
+    raw = yaml_path.read_bytes()
+    data = yaml.safe_load(raw)
+    out_path = yaml_path.with_name(filename)
+    out_path.write_text(
+        PYTHON_MODULE_TEMPLATE.format(
+            source=yaml_path.name,
+            source_hash=source_hash(raw),
+            name=name,
+            data=pprint.pformat(data, width=79, sort_dicts=False),
+        ),
+        encoding="utf-8",
+    )
+    return out_path
+
+
+def main() -> int:
+    for yaml_path in sorted(DASHBOARDS_DIR.glob("*.yaml")):
+        if yaml_path.name in PYTHON_MODULES:
+            out_path = bake_python_module(
+                yaml_path, *PYTHON_MODULES[yaml_path.name]
+            )
+        else:
+            out_path = bake_json_sidecar(yaml_path)
+        print(f"{yaml_path.name} -> {out_path.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,7 @@
 #!/usr/bin/env sh
+# Mirrored in-process by ../frontend_installer.py. When changing this script,
+# port the change there and update INSTALLER_SCRIPT_SHA256 (sha256 of this file);
+# until then the integration falls back to running this script with sh.
 set -eu
 
 log() { printf '%s\n' "$*" >&2; }
@@ -0,0 +1,44 @@
+"""Tests for parsing and aggregating pivoted InfluxDB responses."""
+from __future__ import annotations
+
+from datetime import timezone
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.solar_cube.api import (  # noqa: E402
+    _FORECAST_COLUMNS,
+    _aggregate_forecast,
+    _parse_annotated_csv,
+)
+
+# One pivoted table with fields of different types, rows out of time order.
+PIVOTED_CSV = (
+    "#datatype,string,long,dateTime:RFC3339,string,double,long,boolean\r\n"
+    ",result,table,_time,cs/schedule/controller,cs/prices/sell_price_per_kwh,"
+    "cs/schedule/target_soc,cs/forecasts/soc_forecast\r\n"
+    ",_result,0,2024-01-01T01:00:00Z,charge,0.12345,80,true\r\n"
+    ",_result,0,2024-01-01T00:00:00Z,idle,,50,false\r\n"
+    "\r\n"
+)
+
+
+def test_aggregate_forecast_mixed_types() -> None:
+    records = _parse_annotated_csv(
+        PIVOTED_CSV.splitlines(keepends=True), _FORECAST_COLUMNS
+    )
+    rows = _aggregate_forecast(records, timezone.utc)
+
+    assert [row["dt"] for row in rows] == [
+        "2024-01-01T00:00:00+00:00",
+        "2024-01-01T01:00:00+00:00",
+    ]
+    assert rows[0]["ctr"] == "idle"
+    assert rows[0]["sp"] is None
+    assert rows[0]["ts"] == 50
+    assert rows[1]["ctr"] == "charge"
+    assert rows[1]["sp"] == 0.123
+    assert rows[1]["ts"] == 80
+    assert rows[1]["sf"] is True
+    assert rows[1]["cf"] is None
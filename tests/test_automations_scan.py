@@ -0,0 +1,37 @@
+"""Tests for the automations.yaml scan used to decide on text appends."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+pytest.importorskip("homeassistant")
+
+from custom_components.solar_cube import _scan_automations  # noqa: E402
+
+
+def _scan(tmp_path: Path, content: str):
+    path = tmp_path / "automations.yaml"
+    path.write_text(content, encoding="utf-8")
+    return _scan_automations(path)
+
+
+def test_block_list_at_column_zero_is_appendable(tmp_path: Path) -> None:
+    ids, aliases, appendable = _scan(
+        tmp_path, "- id: a\n  alias: A\n- alias: ' B '\n"
+    )
+    assert ids == {"a"}
+    assert aliases == {"a", "b"}
+    assert appendable
+
+
+def test_indented_top_level_list_is_not_appendable(tmp_path: Path) -> None:
+    content = "  - id: a\n    alias: A\n"
+    ids, _, appendable = _scan(tmp_path, content)
+    assert ids == {"a"}
+    assert not appendable
+
+    # Appending column-0 items as text would break the file.
+    with pytest.raises(yaml.YAMLError):
+        yaml.safe_load(content + "- id: b\n")